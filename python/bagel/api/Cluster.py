@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Optional, Tuple, cast, List, Any
+from typing import TYPE_CHECKING, Optional, Tuple, cast, List, Any, Dict
 from pydantic import BaseModel, PrivateAttr
 from uuid import UUID
 import time
@@ -60,6 +60,27 @@ class Cluster(BaseModel):
             embedding_size=embedding_size,
         )
 
+    @classmethod
+    def from_json(cls, client: "API", json_cluster: Dict[str, Any]) -> "Cluster":
+        """Build a Cluster from a server response without re-running pydantic validation
+
+        Args:
+            client: The API the cluster belongs to
+            json_cluster: A cluster as returned by the server
+
+        Returns:
+            Cluster: The cluster
+        """
+        cluster = cls.construct(
+            name=json_cluster["name"],
+            id=UUID(json_cluster["id"]),
+            cluster_size=float(json_cluster["cluster_size"]),
+            embedding_size=json_cluster.get("embedding_size"),
+            metadata=json_cluster.get("metadata"),
+        )
+        cluster._client = client
+        return cluster
+
     def __repr__(self) -> str:
         return f"Cluster(name={self.name})"
 
@@ -2,7 +2,6 @@ from abc import ABC, abstractmethod
 from typing import Sequence, Optional, Dict, Any, List
 from uuid import UUID
 
-import pandas as pd
 from bagel.api.Cluster import Cluster
 from bagel.api.types import (
     ClusterMetadata,
@@ -1,4 +1,4 @@
-from typing import Optional, cast, Any, List, Tuple
+from typing import TYPE_CHECKING, Optional, cast, Any, List, Tuple, Union
 from bagel.api import API
 from bagel.config import System
 from bagel.api.types import (
@@ -16,46 +16,110 @@ from bagel.api.types import (
     ClusterMetadata,
     OneOrMany,
 )
-import pandas as pd
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 from typing import Sequence, Dict
 from bagel.api.Cluster import Cluster
 import bagel.errors as errors
 from uuid import UUID
 from overrides import override
-import base64
-from io import BytesIO
 import os
-import uuid
+import gzip
+import functools
+import random
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+if TYPE_CHECKING:
+    import httpx
 
-import tempfile, zipfile
+# Queries may be answered by the optional HTTP/2 client instead of the requests session
+Response = Union[requests.Response, "httpx.Response"]
 
 BAGEL_USER_ID = "BAGEL_USER_ID"
 BAGEL_API_KEY = "BAGEL_API_KEY"
 
 X_API_KEY = 'x-api-key'
+IDEMPOTENCY_KEY = 'Idempotency-Key'
 
 DEFAULT_TENANT = "default_tenant"
 DEFAULT_DATABASE = "default_database"
 
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+DOWNLOAD_WORKERS = 16
+DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+UPLOAD_WORKERS = 8
+DATASET_CHUNK_SIZE = 8 * 1024 * 1024
+GZIP_MIN_SIZE = 16 * 1024
+
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_BACKOFF_JITTER = 0.5
+RETRY_BACKOFF_MAX = 10.0
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+
 
 class FastAPI(API):
     def __init__(self, system: System):
         super().__init__(system)
         url_prefix = "https" if system.settings.bagel_server_ssl_enabled else "http"
         self.__headers = {"bagel_source": system.settings.bagel_source}
+        # Credentials from the environment are read once, when the client is created
+        self._env_api_key = os.environ.get(BAGEL_API_KEY)
+        self._env_user_id = os.environ.get(BAGEL_USER_ID)
+        self._default_headers = {**self.__headers, X_API_KEY: self._env_api_key}
         system.settings.require("bagel_server_host")
         if system.settings.bagel_server_http_port:
             self._api_url = f"{url_prefix}://{system.settings.bagel_server_host}:{system.settings.bagel_server_http_port}/api/v1"
         else:
             self._api_url = f"{url_prefix}://{system.settings.bagel_server_host}/api/v1"
 
+        # URL templates are built once so hot calls only format in the cluster id
+        self._clusters_url = self._api_url + "/clusters"
+        self._cluster_url = (self._clusters_url + "/{}").format
+        self._cluster_endpoint_url = (self._clusters_url + "/{}/{}").format
+
+        # A single pooled session keeps TCP/TLS connections alive across calls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=_retry_policy(),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(self.__headers)
+        self._session.headers["Content-Type"] = "application/json"
+
+        self._binary_embeddings = system.settings.bagel_binary_embeddings
+        self._gzip_requests = system.settings.bagel_gzip_requests
+        self._split_dataset_uploads = system.settings.bagel_split_dataset_uploads
+
+        # Optional HTTP/2 client so concurrent queries share one multiplexed connection
+        self._http = None
+        if system.settings.bagel_http2:
+            import httpx
+
+            self._http = httpx.Client(
+                http2=True,
+                headers={**self.__headers, "Content-Type": "application/json"},
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                # Limits must be given to the transport; the client ignores them when one is passed
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    retries=RETRY_TOTAL,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                ),
+            )
+
     @override
     def ping(self) -> int:
         """Returns the current server time in nanoseconds to check if the server is alive"""
-        resp = requests.get(self._api_url, headers=self.__headers)
+        resp = self._session.get(self._api_url, headers=self.__headers)
         raise_bagel_error(resp)
         return int(resp.json()["nanosecond heartbeat"])
 
@@ -63,21 +127,16 @@ class FastAPI(API):
     def join_waitlist(self, email: str) -> Dict[str, str]:
         """Add email to waitlist"""
         url = self._api_url.replace("/api/v1", "")
-        resp = requests.get(url + "/join_waitlist/" + email, timeout=60)
+        resp = self._session.get(url + "/join_waitlist/" + email, timeout=60)
         return resp.json()
 
     @override
     def get_all_clusters(self, user_id: str = DEFAULT_TENANT, api_key: Optional[str] = None) -> Sequence[Cluster]:
         """Returns a list of all clusters"""
         headers, user_id = self._extract_headers_with_key_and_user_id(api_key, user_id)
-        resp = requests.get(self._api_url + "/clusters", headers=headers, params={"user_id": user_id});
+        resp = self._session.get(self._clusters_url, headers=headers, params={"user_id": user_id});
         raise_bagel_error(resp)
-        json_clusters = resp.json()
-        clusters = []
-        for json_cluster in json_clusters:
-            clusters.append(Cluster(self, **json_cluster))
-
-        return clusters
+        return [Cluster.from_json(self, json_cluster) for json_cluster in orjson.loads(resp.content)]
 
     @override
     def create_cluster(
@@ -92,9 +151,9 @@ class FastAPI(API):
     ) -> Cluster:
         """Creates a cluster"""
         headers, user_id = self._extract_headers_with_key_and_user_id(api_key, user_id)
-        resp = requests.post(
-            self._api_url + "/clusters",
-            data=json.dumps(
+        resp = self._session.post(
+            self._clusters_url,
+            data=_dumps(
                 {"name": name, "metadata": metadata, "get_or_create": get_or_create,
                  "user_id": user_id, "embedding_model": embedding_model, "dimensions": dimension}
             ),
@@ -120,8 +179,8 @@ class FastAPI(API):
     ) -> Cluster:
         """Returns a cluster"""
         headers, user_id = self._extract_headers_with_key_and_user_id(api_key, user_id)
-        url = f"{self._api_url}/clusters/{name}"
-        resp = requests.get(url, headers=headers, params={
+        url = self._cluster_url(name)
+        resp = self._session.get(url, headers=headers, params={
             "user_id": user_id
         })
         raise_bagel_error(resp)
@@ -160,9 +219,9 @@ class FastAPI(API):
     ) -> None:
         """Updates a cluster"""
         headers = self._popuate_headers_with_api_key(api_key)
-        resp = requests.put(
-            self._api_url + "/clusters/" + str(id),
-            data=json.dumps({"new_metadata": new_metadata, "new_name": new_name}),
+        resp = self._session.put(
+            self._cluster_url(id),
+            data=_dumps({"new_metadata": new_metadata, "new_name": new_name}),
             headers=headers
         )
         raise_bagel_error(resp)
@@ -173,8 +232,8 @@ class FastAPI(API):
                        api_key: Optional[str] = None) -> None:
         """Deletes a cluster"""
         headers, user_id = self._extract_headers_with_key_and_user_id(api_key, user_id)
-        url = f"{self._api_url}/clusters/{name}?user_id={user_id}"
-        resp = requests.delete(url, headers=headers)
+        url = self._cluster_url(name) + f"?user_id={user_id}"
+        resp = self._session.delete(url, headers=headers)
         raise_bagel_error(resp)
 
     @override
@@ -182,7 +241,7 @@ class FastAPI(API):
                api_key: Optional[str] = None) -> int:
         """Returns the number of embeddings in the database"""
         headers = self._popuate_headers_with_api_key(api_key)
-        resp = requests.get(self._api_url + "/clusters/" + str(cluster_id) + "/count", headers=headers)
+        resp = self._session.get(self._cluster_endpoint_url(cluster_id, "count"), headers=headers)
         raise_bagel_error(resp)
         return cast(int, resp.json())
 
@@ -216,9 +275,9 @@ class FastAPI(API):
             offset = (page - 1) * page_size
             limit = page_size
 
-        resp = requests.post(
-            self._api_url + "/clusters/" + str(cluster_id) + "/get",
-            data=json.dumps(
+        resp = self._session.post(
+            self._cluster_endpoint_url(cluster_id, "get"),
+            data=_dumps(
                 {
                     "ids": ids,
                     "where": where,
@@ -233,7 +292,7 @@ class FastAPI(API):
         )
 
         raise_bagel_error(resp)
-        body = resp.json()
+        body = orjson.loads(resp.content)
         return GetResult(
             ids=body["ids"],
             embeddings=body.get("embeddings", None),
@@ -252,9 +311,9 @@ class FastAPI(API):
     ) -> IDs:
         """Deletes embeddings from the database"""
 
-        resp = requests.post(
-            self._api_url + "/clusters/" + str(cluster_id) + "/delete",
-            data=json.dumps(
+        resp = self._session.post(
+            self._cluster_endpoint_url(cluster_id, "delete"),
+            data=_dumps(
                 {"where": where, "ids": ids, "where_document": where_document}
             ),
         )
@@ -289,22 +348,36 @@ class FastAPI(API):
             the image along with metadata to the Bagel API for addition to
             the specified cluster.
         """
+        import base64
+        import mmap
+        import stat
+
         headers = self._popuate_headers_with_api_key(api_key)
         image_name = os.path.basename(filename)
         uid = str(uuid.uuid4())
+        # Encode straight from a memory map so the raw file is never copied into a
+        # Python bytes object. Only non-empty regular files can be mapped; pipes and
+        # special files report a size of 0 and are read instead
         with open(filename, "rb") as i:
-            image_data = base64.b64encode(i.read()).decode('utf-8')
+            file_stat = os.fstat(i.fileno())
+            if stat.S_ISREG(file_stat.st_mode) and file_stat.st_size > 0:
+                with mmap.mmap(i.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    encoded = base64.b64encode(mm)
+            else:
+                encoded = base64.b64encode(i.read())
+        image_data = encoded.decode('ascii')
+        del encoded
 
         if metadata is None:
             metadata = {"filename": str(image_name)}
-        data = json.dumps({
+        data = _dumps({
             "metadatas": [metadata],
             "ids": [uid],
             "increment_index": True,
             "documents": [image_data]
         })
-        resp = requests.post(
-            self._api_url + "/clusters/" + str(cluster_id) + "/add_image",
+        resp = self._session.post(
+            self._cluster_endpoint_url(cluster_id, "add_image"),
             data=data,
             headers=headers
         )
@@ -329,18 +402,19 @@ class FastAPI(API):
         -     and then manually create the index yourself with cluster.create_index()
         """
         headers = self._popuate_headers_with_api_key(api_key)
-        resp = requests.post(
-            self._api_url + "/clusters/" + str(cluster_id) + "/add",
-            data=json.dumps(
-                {
-                    "ids": ids,
-                    "embeddings": embeddings,
-                    "metadatas": metadatas,
-                    "documents": documents,
-                    "increment_index": increment_index,
-                }
-            ),
-            headers=headers
+        # Lets the server discard duplicates of a retried add
+        headers = {**headers, IDEMPOTENCY_KEY: uuid.uuid4().hex}
+        resp = self._post_embeddings(
+            self._cluster_endpoint_url(cluster_id, "add"),
+            {
+                "ids": ids,
+                "embeddings": embeddings,
+                "metadatas": metadatas,
+                "documents": documents,
+                "increment_index": increment_index,
+            },
+            "embeddings",
+            headers
         )
 
         raise_bagel_error(resp)
@@ -361,9 +435,9 @@ class FastAPI(API):
         - pass in column oriented data lists
         """
         headers = self._popuate_headers_with_api_key(api_key)
-        resp = requests.post(
-            self._api_url + "/clusters/" + str(cluster_id) + "/update",
-            data=json.dumps(
+        resp = self._session.post(
+            self._cluster_endpoint_url(cluster_id, "update"),
+            data=_dumps(
                 {
                     "ids": ids,
                     "embeddings": embeddings,
@@ -394,19 +468,20 @@ class FastAPI(API):
         """
         
         headers = self._popuate_headers_with_api_key(api_key)
-
-        resp = requests.post(
-            self._api_url + "/clusters/" + str(cluster_id) + "/upsert",
-            data=json.dumps(
-                {
-                    "ids": ids,
-                    "embeddings": embeddings,
-                    "metadatas": metadatas,
-                    "documents": documents,
-                    "increment_index": increment_index,
-                }
-            ),
-            headers = headers
+        # Lets the server discard duplicates of a retried upsert
+        headers = {**headers, IDEMPOTENCY_KEY: uuid.uuid4().hex}
+
+        resp = self._post_embeddings(
+            self._cluster_endpoint_url(cluster_id, "upsert"),
+            {
+                "ids": ids,
+                "embeddings": embeddings,
+                "metadatas": metadatas,
+                "documents": documents,
+                "increment_index": increment_index,
+            },
+            "embeddings",
+            headers
         )
 
         resp.raise_for_status()
@@ -426,33 +501,23 @@ class FastAPI(API):
     ) -> QueryResult:
         """Gets the nearest neighbors of a single embedding"""
         headers = self._popuate_headers_with_api_key(api_key)
-        
-        max_retries = 3
-        retry_delay = 1  # in seconds
-        
-        for attempt in range(max_retries):
-            resp = requests.post(
-                self._api_url + "/clusters/" + str(cluster_id) + "/query",
-                data=json.dumps(
-                    {
-                        "query_embeddings": query_embeddings,
-                        "n_results": n_results,
-                        "where": where,
-                        "where_document": where_document,
-                        "include": include,
-                        "query_texts": query_texts,
-                    }
-                ),
-                headers=headers
-            )
-            
-            if resp.ok:
-                break
-            elif attempt < max_retries - 1:
-                time.sleep(retry_delay)
-        
+        resp = self._post_embeddings(
+            self._cluster_endpoint_url(cluster_id, "query"),
+            {
+                "query_embeddings": query_embeddings,
+                "n_results": n_results,
+                "where": where,
+                "where_document": where_document,
+                "include": include,
+                "query_texts": query_texts,
+            },
+            "query_embeddings",
+            headers,
+            multiplexed=True
+        )
+
         raise_bagel_error(resp)
-        body = resp.json()
+        body = orjson.loads(resp.content)
 
         return QueryResult(
             ids=body["ids"],
@@ -465,21 +530,21 @@ class FastAPI(API):
     @override
     def reset(self) -> None:
         """Resets the database"""
-        resp = requests.post(self._api_url + "/reset")
+        resp = self._session.post(self._api_url + "/reset")
         raise_bagel_error(resp)
 
     @override
     def persist(self) -> bool:
         """Persists the database"""
-        resp = requests.post(self._api_url + "/persist")
+        resp = self._session.post(self._api_url + "/persist")
         raise_bagel_error(resp)
         return cast(bool, resp.json())
 
     @override
     def create_index(self, cluster_name: str) -> bool:
         """Creates an index for the given space key"""
-        resp = requests.post(
-            self._api_url + "/clusters/" + cluster_name + "/create_index"
+        resp = self._session.post(
+            self._cluster_endpoint_url(cluster_name, "create_index")
         )
         raise_bagel_error(resp)
         return cast(bool, resp.json())
@@ -487,7 +552,7 @@ class FastAPI(API):
     @override
     def get_version(self) -> str:
         """Returns the version of the server"""
-        resp = requests.get(self._api_url + "/version", headers=self.__headers)
+        resp = self._session.get(self._api_url + "/version", headers=self.__headers)
         raise_bagel_error(resp)
         return cast(str, resp.json())
 
@@ -496,9 +561,9 @@ class FastAPI(API):
 
         headers = self._popuate_headers_with_api_key(None)
 
-        resp = requests.post(
+        resp = self._session.post(
             self._api_url + "/share-cluster",
-            data=json.dumps(
+            data=_dumps(
                 {
                     "cluster_id": cluster_id,
                     "user_names": usernames
@@ -524,9 +589,9 @@ class FastAPI(API):
         if metadatas is None:
             metadatas = [{"url": str(url)} for url in urls]
 
-        resp = requests.post(
-            self._api_url + "/clusters/" + str(cluster_id) + "/add_image_url",
-            data=json.dumps(
+        resp = self._session.post(
+            self._cluster_endpoint_url(cluster_id, "add_image_url"),
+            data=_dumps(
                 {
                     "ids": ids,
                     "image_urls": urls,
@@ -540,23 +605,73 @@ class FastAPI(API):
         raise_bagel_error(resp)
         return resp.json()
 
+    def _post_embeddings(self, url: str, payload: Dict[str, Any], embeddings_key: str,
+                         headers: Dict[str, str], multiplexed: bool = False) -> Response:
+        """POST a payload carrying embeddings, packing them as raw float32 msgpack when
+        binary embeddings are enabled and falling back to JSON if the server rejects it"""
+        if self._binary_embeddings and payload[embeddings_key] is not None:
+            import msgpack
+            import numpy as np
+
+            try:
+                emb = np.ascontiguousarray(payload[embeddings_key], dtype="<f4")
+            except (ValueError, TypeError):
+                # Ragged or non-numeric embeddings have no packed form; send them as JSON
+                emb = None
+
+            if emb is not None:
+                binary_payload = {k: v for k, v in payload.items() if k != embeddings_key}
+                binary_payload["embeddings_shape"] = list(emb.shape)
+                binary_payload["embeddings_bytes"] = emb.tobytes()
+                resp = self._post(
+                    url,
+                    msgpack.packb(binary_payload, use_bin_type=True),
+                    {**headers, "Content-Type": "application/msgpack"},
+                    multiplexed
+                )
+                if resp.status_code != 415:
+                    return resp
+                self._binary_embeddings = False
+
+        data = _dumps(payload)
+        if self._gzip_requests:
+            data, encoding_headers = _maybe_gzip(data)
+            headers = {**headers, **encoding_headers}
+        return self._post(url, data, headers, multiplexed)
+
+    def _post(self, url: str, data: bytes, headers: Dict[str, str], multiplexed: bool = False) -> Response:
+        """POST a raw body, over the shared HTTP/2 client when multiplexed and HTTP/2 is enabled.
+        Overloaded and gateway responses are retried, so callers must be safe to replay:
+        queries, or writes carrying an Idempotency-Key"""
+        if multiplexed and self._http is not None:
+            # httpx rejects None header values, which requests silently drops
+            headers = {k: v for k, v in headers.items() if v is not None}
+            send = functools.partial(self._http.post, url, content=data, headers=headers)
+        else:
+            send = functools.partial(self._session.post, url, data=data, headers=headers)
+
+        for attempt in range(RETRY_TOTAL + 1):
+            resp = send()
+            if resp.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                return resp
+            time.sleep(_retry_delay(attempt, resp))
+
     def _extract_headers_with_key_and_user_id(self, api_key, user_id):
         api_key, user_id = self._extract_user_id_and_api_key(api_key, user_id)
         headers = self._popuate_headers_with_api_key(api_key)
         return headers, user_id
 
     def _popuate_headers_with_api_key(self, api_key):
-        headers = self.__headers.copy()  # Make a copy of headers to avoid modifying original headers
-        if os.environ.get(BAGEL_API_KEY) is not None and api_key is None:
-            api_key = os.environ.get(BAGEL_API_KEY)
-        headers[X_API_KEY] = api_key  # Add API key to headers
-        return headers
+        # The default headers are shared between calls and must not be modified
+        if api_key is None:
+            return self._default_headers
+        return {**self.__headers, X_API_KEY: api_key}
 
     def _extract_user_id_and_api_key(self, api_key, user_id):
-        if os.environ.get(BAGEL_USER_ID) is not None and user_id == DEFAULT_TENANT:
-            user_id = os.environ.get(BAGEL_USER_ID)
-        if os.environ.get(BAGEL_API_KEY) is not None and api_key is None:
-            api_key = os.environ.get(BAGEL_API_KEY)
+        if self._env_user_id is not None and user_id == DEFAULT_TENANT:
+            user_id = self._env_user_id
+        if self._env_api_key is not None and api_key is None:
+            api_key = self._env_api_key
         return api_key, user_id
     
     @override
@@ -584,7 +699,7 @@ class FastAPI(API):
             "user_id": user_id
         }
         
-        resp = requests.post(url, headers=headers, data=json.dumps(data))
+        resp = self._session.post(url, headers=headers, data=_dumps(data))
         raise_bagel_error(resp)
         
         resp_text = resp.text
@@ -605,7 +720,7 @@ class FastAPI(API):
         
         data = {'dataset_id': dataset_id, 'path': path}
         
-        resp = requests.get(url, headers=headers, params=data)
+        resp = self._session.get(url, headers=headers, params=data)
 
         resp_json = resp.json()
         
@@ -620,18 +735,51 @@ class FastAPI(API):
             file_content: bytes = None,
             api_key: Optional[str] = None
     ) -> str:
-        """Upload a dataset file to Bagel."""
-        headers = self._popuate_headers_with_api_key(api_key)
+        """Upload a dataset file to Bagel.
+
+        Returns the server's response text, whatever its status. With
+        bagel_split_dataset_uploads enabled, content larger than
+        DATASET_CHUNK_SIZE is split into chunks numbered from chunk_number
+        onwards, which are posted concurrently, and a rejected chunk raises.
+        """
+        # Built once and shared read-only by every chunk. The session's JSON
+        # content type is dropped so requests sets the multipart boundary
+        headers = {**self._popuate_headers_with_api_key(api_key), "Content-Type": None}
         url = f"{self._api_url}/datasets/{dataset_id}/upload-dataset-git"
 
-        params = {'dataset_id': dataset_id, 'chunk_number': chunk_number, 'file_name': file_name}
+        if not self._split_dataset_uploads:
+            return self._upload_chunk(url, headers, dataset_id, chunk_number, file_name, file_content).text
+
+        chunks = _split_chunks(file_content, DATASET_CHUNK_SIZE)
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            futures = [
+                pool.submit(self._upload_chunk, url, headers, dataset_id, chunk_number + i, file_name, chunk)
+                for i, chunk in enumerate(chunks)
+            ]
+            # Waits for the chunks in order and fails on the first rejected one
+            for future in futures:
+                resp = future.result()
+                raise_bagel_error(resp)
 
-        files = {'data_file': (file_name, file_content)}
-        
-        resp = requests.post(url, headers=headers, files=files, params=params)
-        
         return resp.text
-    
+
+    def _upload_chunk(
+            self,
+            url: str,
+            headers: Dict[str, str],
+            dataset_id: str,
+            chunk_number: int,
+            file_name: str,
+            chunk: Optional[Union[bytes, memoryview]]
+    ) -> requests.Response:
+        """Post a single numbered chunk of a dataset file. Chunks may be posted
+        concurrently, so params and files are per call and headers are never mutated."""
+        params = {'dataset_id': dataset_id, 'chunk_number': chunk_number, 'file_name': file_name}
+
+        files = {'data_file': (file_name, chunk)}
+
+        return self._session.post(url, headers=headers, files=files, params=params)
+
     @override
     def download_dataset(
             self,
@@ -645,11 +793,11 @@ class FastAPI(API):
         
         params = {'dataset_id': dataset_id, 'file_path': file_path}
         
-        resp = requests.get(url, headers=headers, params=params)
+        resp = self._session.get(url, headers=headers, params=params)
         # raise_bagel_error(resp)
         
         file_content = resp.content
-        file_name = resp.headers.get('Content-Disposition', '').split('filename=')[1].strip('"')
+        file_name = _attachment_file_name(resp)
         file_type = resp.headers.get('Content-Type', '')
         
         return file_content, file_name, file_type
@@ -663,45 +811,153 @@ class FastAPI(API):
             api_key: Optional[str] = None
             ) -> bool:
         
+        os.makedirs(target_dir, exist_ok=True)
+
+        # Listing directories is cheap; the file downloads are network bound,
+        # so fetch them concurrently over the pooled session
+        file_paths = self._list_dataset_files(dataset_id, file_path)
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+            futures = [
+                pool.submit(self._download_dataset_file, dataset_id, path, target_dir, api_key)
+                for path in file_paths
+            ]
+
+        # Every download has finished once the pool is closed. Part files are moved
+        # into place in listing order, so files sharing a name resolve to the last
+        # one listed however the downloads were scheduled
+        parts = [future.result() for future in futures if future.exception() is None]
+        try:
+            for future in futures:
+                future.result()
+            for part_path, target_path in parts:
+                os.replace(part_path, target_path)
+        except BaseException:
+            for part_path, _ in parts:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+            raise
+
+        return True
+
+    def _download_dataset_file(
+            self,
+            dataset_id: str,
+            file_path: str,
+            target_dir: str,
+            api_key: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Stream a single dataset file to a part file in target_dir without holding it
+        in memory, returning the part file and the path it should be moved to."""
         headers = self._popuate_headers_with_api_key(api_key)
+        url = f"{self._api_url}/download-dataset-git"
 
-        os.makedirs(target_dir, exist_ok=True)
-        
+        params = {'dataset_id': dataset_id, 'file_path': file_path}
+
+        with self._session.get(url, headers=headers, params=params, stream=True) as resp:
+            target_path = os.path.join(target_dir, _attachment_file_name(resp))
+            # Write to a private part file, so a failed or concurrent download of the
+            # same name never leaves a torn file
+            part_path = f"{target_path}.{uuid.uuid4().hex}.part"
+            try:
+                with open(part_path, "wb") as file:
+                    for block in resp.iter_content(chunk_size=DOWNLOAD_BLOCK_SIZE):
+                        file.write(block)
+            except BaseException:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+
+        return part_path, target_path
+
+    def _list_dataset_files(self, dataset_id: str, file_path: Optional[str] = "") -> List[str]:
+        """Recursively collect the paths of all files under file_path in a dataset."""
         dataset_info = self.get_dataset_info(dataset_id, file_path)
         file_types = ["file", "dir"]
 
         repo_info = dataset_info['repo_info']
         files = repo_info['files']
 
+        file_paths = []
         for file_info in files:
-            file_path = file_info['path']
             if file_info['type'] == file_types[0]:
-                file_content, file_name, file_type = self.download_dataset(
-                    dataset_id=dataset_id,
-                    file_path=file_path
-                )
+                file_paths.append(file_info['path'])
+            elif file_info['type'] == file_types[1]:
+                file_paths.extend(self._list_dataset_files(dataset_id, file_info['path']))
+
+        return file_paths
+
+
+def _retry_policy() -> Retry:
+    """Exponential backoff with jitter on overload and gateway errors for idempotent
+    methods, honouring Retry-After"""
+    options = dict(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=sorted(RETRY_STATUSES),
+        # POST is not replayed here; _post retries only queries and keyed writes
+        allowed_methods=frozenset(["GET", "PUT", "DELETE"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=RETRY_BACKOFF_JITTER, backoff_max=RETRY_BACKOFF_MAX, **options)
+    except TypeError:  # urllib3 < 2.0 has no backoff jitter or per-instance cap
+        return Retry(**options)
 
-                file_path = os.path.join(target_dir, file_name)
-                with open(file_path, "wb") as file:
-                    file.write(file_content)
 
-            elif file_info['type'] == file_types[1]:
-                self.download_dataset_files(dataset_id, target_dir, file_path)
-        
-        return True
+def _retry_delay(attempt: int, resp: Any) -> float:
+    """Seconds to wait after failed attempt number attempt (from 0): capped exponential
+    backoff plus jitter from the first retry on, or a Retry-After given in seconds"""
+    retry_after = resp.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    backoff = min(RETRY_BACKOFF_FACTOR * (2 ** attempt), RETRY_BACKOFF_MAX)
+    return backoff + random.random() * RETRY_BACKOFF_JITTER
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a request body to JSON bytes, handling numpy arrays and scalars natively"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
 
 
-def raise_bagel_error(resp: requests.Response) -> None:
+def _maybe_gzip(body: bytes) -> Tuple[bytes, Dict[str, str]]:
+    """Gzip a request body at the fastest level if it is large enough to be worth it"""
+    if len(body) < GZIP_MIN_SIZE:
+        return body, {}
+    return gzip.compress(body, compresslevel=1), {"Content-Encoding": "gzip"}
+
+
+def _attachment_file_name(resp: requests.Response) -> str:
+    """Return the file name from a response's Content-Disposition header"""
+    return resp.headers.get('Content-Disposition', '').split('filename=')[1].strip('"')
+
+
+def _split_chunks(content: Optional[bytes], chunk_size: int) -> List[Optional[Union[bytes, memoryview]]]:
+    """Split content into chunk_size pieces, folding a small trailing piece into the previous one.
+    Pieces are zero-copy views into content."""
+    if content is None or len(content) <= chunk_size:
+        return [content]
+
+    starts = list(range(0, len(content), chunk_size))
+    if len(content) - starts[-1] < chunk_size // 4:
+        starts.pop()
+    ends = starts[1:] + [len(content)]
+
+    view = memoryview(content)
+    return [view[start:end] for start, end in zip(starts, ends)]
+
+
+def raise_bagel_error(resp: Response) -> None:
     """Raises an error if the response is not ok, using a BagelError if possible"""
-    if resp.ok:
+    if resp.status_code < 400:
         return
 
     bagel_error = None
     try:
-        body = resp.json()
-        if "error" in body:
-            if body["error"] in errors.error_types:
-                bagel_error = errors.error_types[body["error"]](body["message"])
+        body = orjson.loads(resp.content)
+        error_type = errors.error_types.get(body.get("error"))
+        if error_type:
+            bagel_error = error_type(body["message"])
 
     except BaseException:
         pass
@@ -709,7 +965,4 @@ def raise_bagel_error(resp: requests.Response) -> None:
     if bagel_error:
         raise bagel_error
 
-    try:
-        resp.raise_for_status()
-    except requests.HTTPError:
-        raise (Exception(resp.text))
+    raise (Exception(resp.text))
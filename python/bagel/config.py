@@ -40,6 +40,15 @@ class Settings(BaseSettings):
     bagel_server_host: Optional[str] = None
     bagel_server_http_port: Optional[str] = None
     bagel_server_ssl_enabled: Optional[bool] = False
+    # Send embeddings as packed float32 msgpack instead of JSON float lists
+    bagel_binary_embeddings: bool = False
+    # Send queries over a multiplexed HTTP/2 connection (requires the http2 extra)
+    bagel_http2: bool = False
+    # Gzip large JSON embedding payloads (the server must accept Content-Encoding: gzip)
+    bagel_gzip_requests: bool = False
+    # Split large dataset uploads into concurrently posted chunks (the server must
+    # reassemble chunks by chunk_number, whatever order they arrive in)
+    bagel_split_dataset_uploads: bool = False
     bagel_server_grpc_port: Optional[str] = None
     bagel_server_cors_allow_origins: List[str] = []
     anonymized_telemetry: bool = True
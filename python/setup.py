@@ -11,7 +11,9 @@ dependencies = [
     "charset-normalizer>=3.2.0",
     "graphlib-backport>=1.0.3",
     "idna>=3.4",
+    "msgpack>=1.0.0",
     "numpy>=1.21.6",
+    "orjson>=3.8.0",
     "overrides>=7.3.1",
     "pandas>=2.0.1",
     "pydantic>=1.10.10,<2.0",
@@ -46,6 +48,7 @@ setup(
     url="https://github.com/BagelNetwork/Client",
     packages=find_packages(),
     install_requires=dependencies,
+    extras_require={"http2": ["httpx[http2]>=0.24"]},
     classifiers=classifiers,
 )
 
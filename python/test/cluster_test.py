@@ -0,0 +1,35 @@
+from uuid import UUID
+
+from bagel.api.Cluster import Cluster
+
+
+CLUSTER_JSON = {
+    "id": "8b0fbd4e-2c70-4c58-9c8f-52b3f2c1a1a1",
+    "name": "cluster",
+    "metadata": {"source": "google"},
+    "cluster_size": 3,
+    "embedding_size": 512,
+}
+
+
+def test_from_json_matches_constructor():
+    client = object()
+    from_json = Cluster.from_json(client, CLUSTER_JSON)
+    constructed = Cluster(client, **CLUSTER_JSON)
+
+    assert from_json == constructed
+    assert from_json.dict() == constructed.dict()
+    assert from_json._client is client
+
+
+def test_from_json_coerces_types():
+    cluster = Cluster.from_json(object(), CLUSTER_JSON)
+    assert cluster.id == UUID(CLUSTER_JSON["id"])
+    assert isinstance(cluster.cluster_size, float)
+
+
+def test_from_json_optional_fields():
+    json_cluster = {"id": CLUSTER_JSON["id"], "name": "cluster", "cluster_size": 0}
+    cluster = Cluster.from_json(object(), json_cluster)
+    assert cluster == Cluster(object(), **json_cluster)
+    assert cluster.metadata is None and cluster.embedding_size is None
@@ -0,0 +1,270 @@
+import base64
+import gzip
+import os
+import threading
+
+import msgpack
+import numpy as np
+import orjson
+import pytest
+
+import bagel.api.fastapi as fastapi
+from bagel.api.fastapi import (
+    GZIP_MIN_SIZE,
+    IDEMPOTENCY_KEY,
+    RETRY_BACKOFF_MAX,
+    RETRY_STATUSES,
+    RETRY_TOTAL,
+    FastAPI,
+    _maybe_gzip,
+    _retry_delay,
+    _retry_policy,
+    _split_chunks,
+)
+from bagel.config import Settings, System
+
+
+class _Response:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = f"status {status_code}"
+
+
+class _Transport:
+    """Stands in for the requests session or httpx client, replying with statuses in turn"""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.calls = []
+
+    def post(self, url, **kwargs):
+        self.calls.append(kwargs)
+        return _Response(self.statuses.pop(0))
+
+
+class _Download:
+    """A streamed file download whose body is sent once release is set"""
+
+    def __init__(self, name, body, release, done, error=None):
+        self.headers = {"Content-Disposition": f'attachment; filename="{name}"'}
+        self.body = body
+        self.error = error
+        self.release = release
+        self.done = done
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.done.set()
+
+    def iter_content(self, chunk_size):
+        assert self.release.wait(5)
+        yield self.body
+        if self.error is not None:
+            raise self.error
+
+
+class _Downloads:
+    """Stands in for the requests session, serving dataset files by path"""
+
+    def __init__(self, files):
+        self.files = files
+
+    def get(self, url, params, **kwargs):
+        return self.files[params["file_path"]]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(fastapi.time, "sleep", lambda seconds: None)
+    return FastAPI(System(Settings(bagel_server_host="localhost")))
+
+
+def test_split_chunks_keeps_small_content_whole():
+    assert _split_chunks(None, 8) == [None]
+    assert _split_chunks(b"", 8) == [b""]
+    assert _split_chunks(b"a" * 8, 8) == [b"a" * 8]
+
+
+def test_split_chunks_folds_small_tail():
+    # 1 byte is below a quarter of the chunk size, so it joins the previous chunk
+    chunks = _split_chunks(b"a" * 17, 8)
+    assert [bytes(c) for c in chunks] == [b"a" * 8, b"a" * 9]
+
+
+def test_split_chunks_keeps_tail_at_fold_boundary():
+    # 2 bytes is exactly a quarter of the chunk size, so it stays a chunk of its own
+    chunks = _split_chunks(b"a" * 18, 8)
+    assert [bytes(c) for c in chunks] == [b"a" * 8, b"a" * 8, b"a" * 2]
+
+
+def test_split_chunks_preserves_content_without_copying():
+    content = bytes(range(100))
+    chunks = _split_chunks(content, 10)
+    assert all(isinstance(c, memoryview) for c in chunks)
+    assert b"".join(chunks) == content
+
+
+def test_maybe_gzip_below_threshold():
+    body = b"x" * (GZIP_MIN_SIZE - 1)
+    assert _maybe_gzip(body) == (body, {})
+
+
+def test_maybe_gzip_at_threshold():
+    body = b"x" * GZIP_MIN_SIZE
+    data, headers = _maybe_gzip(body)
+    assert headers == {"Content-Encoding": "gzip"}
+    assert gzip.decompress(data) == body
+
+
+def test_retry_policy():
+    retry = _retry_policy()
+    assert retry.total == RETRY_TOTAL
+    assert set(retry.status_forcelist) == RETRY_STATUSES
+    assert "POST" not in retry.allowed_methods
+    assert retry.respect_retry_after_header
+    assert not retry.raise_on_status
+
+
+def test_retry_delay():
+    assert 0.5 <= _retry_delay(0, _Response()) < 1.0
+    assert 1.0 <= _retry_delay(1, _Response()) < 1.5
+    assert RETRY_BACKOFF_MAX <= _retry_delay(10, _Response()) < RETRY_BACKOFF_MAX + 0.5
+    assert _retry_delay(1, _Response(headers={"Retry-After": "7"})) == 7
+    assert 1.0 <= _retry_delay(1, _Response(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) < 1.5
+
+
+def test_post_retries_overload_until_success(api):
+    api._session = _Transport(503, 429, 200)
+    resp = api._post("http://localhost/q", b"{}", {})
+    assert resp.status_code == 200
+    assert len(api._session.calls) == 3
+
+
+def test_post_returns_last_response_when_retries_run_out(api):
+    api._session = _Transport(*[502] * (RETRY_TOTAL + 1))
+    resp = api._post("http://localhost/q", b"{}", {})
+    assert resp.status_code == 502
+    assert len(api._session.calls) == RETRY_TOTAL + 1
+
+
+def test_post_does_not_retry_other_errors(api):
+    api._session = _Transport(500, 200)
+    assert api._post("http://localhost/q", b"{}", {}).status_code == 500
+    assert len(api._session.calls) == 1
+
+
+def test_post_retries_over_http2(api):
+    api._session = _Transport()
+    api._http = _Transport(504, 200)
+    resp = api._post("http://localhost/q", b"{}", {"Content-Type": None, "x": "1"}, multiplexed=True)
+    assert resp.status_code == 200
+    assert len(api._http.calls) == 2
+    assert api._http.calls[0] == {"content": b"{}", "headers": {"x": "1"}}
+    assert api._session.calls == []
+
+
+def test_download_dataset_files_resolves_shared_names_in_listing_order(api, tmp_path):
+    first_done, last_done = threading.Event(), threading.Event()
+    # The last listed file finishes before the first one is even sent
+    api._session = _Downloads({
+        "a/same.txt": _Download("same.txt", b"first", last_done, first_done),
+        "b/same.txt": _Download("same.txt", b"last", threading.Event(), last_done),
+    })
+    api._session.files["b/same.txt"].release.set()
+    api._list_dataset_files = lambda dataset_id, file_path: ["a/same.txt", "b/same.txt"]
+
+    assert api.download_dataset_files("dataset", str(tmp_path))
+    assert first_done.is_set()
+    assert (tmp_path / "same.txt").read_bytes() == b"last"
+    assert [p.name for p in tmp_path.iterdir()] == ["same.txt"]
+
+
+def test_download_dataset_files_removes_part_files_on_failure(api, tmp_path):
+    released = threading.Event()
+    released.set()
+    api._session = _Downloads({
+        "ok.txt": _Download("ok.txt", b"ok", released, threading.Event()),
+        "broken.txt": _Download("broken.txt", b"half", released, threading.Event(), IOError("reset")),
+    })
+    api._list_dataset_files = lambda dataset_id, file_path: ["ok.txt", "broken.txt"]
+
+    with pytest.raises(IOError, match="reset"):
+        api.download_dataset_files("dataset", str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_post_embeddings_packs_float32_msgpack(api):
+    api._binary_embeddings = True
+    api._session = _Transport(200)
+    payload = {"ids": ["a", "b"], "embeddings": [[1.0, 2.0], [3.0, 4.0]]}
+    api._post_embeddings("http://localhost/add", payload, "embeddings", {})
+
+    call = api._session.calls[0]
+    assert call["headers"]["Content-Type"] == "application/msgpack"
+    body = msgpack.unpackb(call["data"], raw=False)
+    assert "embeddings" not in body
+    assert body["ids"] == ["a", "b"]
+    assert body["embeddings_shape"] == [2, 2]
+    assert np.frombuffer(body["embeddings_bytes"], dtype="<f4").tolist() == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_add_resends_json_with_same_idempotency_key_on_415(api):
+    api._binary_embeddings = True
+    api._session = _Transport(415, 200, 200)
+    api._add(["a"], "cluster", embeddings=[[1.0, 2.0]])
+
+    packed, resent = api._session.calls
+    assert packed["headers"]["Content-Type"] == "application/msgpack"
+    assert "Content-Type" not in resent["headers"]
+    assert orjson.loads(resent["data"])["embeddings"] == [[1.0, 2.0]]
+    assert resent["headers"][IDEMPOTENCY_KEY] == packed["headers"][IDEMPOTENCY_KEY]
+    assert not api._binary_embeddings
+
+    # Later calls go straight to JSON
+    api._add(["b"], "cluster", embeddings=[[3.0, 4.0]])
+    assert len(api._session.calls) == 3
+    assert orjson.loads(api._session.calls[2]["data"])["ids"] == ["b"]
+
+
+def test_post_embeddings_sends_ragged_embeddings_as_json(api):
+    api._binary_embeddings = True
+    api._session = _Transport(200)
+    payload = {"ids": ["a", "b"], "embeddings": [[1.0, 2.0], [3.0]]}
+    api._post_embeddings("http://localhost/add", payload, "embeddings", {})
+
+    assert orjson.loads(api._session.calls[0]["data"]) == payload
+    assert api._binary_embeddings
+
+
+def _added_image(api):
+    return orjson.loads(api._session.calls[0]["data"])["documents"][0]
+
+
+def test_add_image_encodes_regular_file(api, tmp_path):
+    image = tmp_path / "image.png"
+    image.write_bytes(b"\x89PNG" * 100)
+    api._session = _Transport(200)
+    api._add_image("cluster", str(image))
+    assert base64.b64decode(_added_image(api)) == b"\x89PNG" * 100
+
+
+def test_add_image_reads_files_that_cannot_be_mapped(api):
+    # A pipe reports a size of 0, so it must be read rather than memory-mapped
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"\x89PNG" * 100)
+    os.close(write_fd)
+    api._session = _Transport(200)
+    try:
+        api._add_image("cluster", f"/dev/fd/{read_fd}")
+    finally:
+        os.close(read_fd)
+    assert base64.b64decode(_added_image(api)) == b"\x89PNG" * 100
+
+
+def test_upload_dataset_returns_error_text_unless_split(api):
+    api._session = _Transport(500)
+    assert api.upload_dataset("dataset", 1, "data.csv", b"a,b\n") == "status 500"
+    assert len(api._session.calls) == 1